@@ -20,6 +20,11 @@ setup(
     python_requires=">=3.8.0",
     setup_requires=["setuptools_scm"],
     install_requires=read_requirements(requirements_path),
+    extras_require={
+        "ciso8601": ["ciso8601"],
+        "orjson": ["orjson"],
+        "pillow": ["Pillow"],
+    },
     use_scm_version={
         "version_scheme": "guess-next-dev",
         "local_scheme": "dirty-tag",
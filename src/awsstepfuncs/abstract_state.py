@@ -5,8 +5,9 @@ Based on this table: https://states-language.net/spec.html#state-type-table
 from __future__ import annotations
 
 import re
+import sys
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from awsstepfuncs.error_handlers import Catcher, Retrier
 from awsstepfuncs.errors import AWSStepFuncsValueError
@@ -20,6 +21,13 @@ MAX_STATE_NAME_LENGTH = 128
 class AbstractState(ABC):
     """An Amazon States Language state including Name, Comment, and Type."""
 
+    # Compiled field, attribute and whether an unset (None) attribute is compiled
+    # as null, in compiled order. Other falsy values (such as the default
+    # Reference Path $) are left out
+    _compiled_fields: Tuple[Tuple[str, str, bool], ...] = (
+        ("Comment", "comment", False),
+    )
+
     def __init__(self, name: str, comment: Optional[str] = None):
         """Initialize subclasses.
 
@@ -36,7 +44,9 @@ class AbstractState(ABC):
                 f"State name cannot exceed {MAX_STATE_NAME_LENGTH} characters"
             )
 
-        self.name = name
+        # Names are used as keys all over (state machine validation, compiling,
+        # visualization), so intern them once here
+        self.name = sys.intern(name)
         self.comment = comment
         self.next_state: Optional[AbstractState] = None
         self.print: Printer  # Used for simulations
@@ -49,9 +59,16 @@ class AbstractState(ABC):
             Language.
         """
         assert self.state_type  # type: ignore
-        compiled = {"Type": self.state_type}  # type: ignore
-        if comment := self.comment:
-            compiled["Comment"] = comment
+        compiled: Dict[str, Any] = {"Type": self.state_type}  # type: ignore
+        for key, attribute, compile_none in self._compiled_fields:
+            value = getattr(self, attribute)
+            if value is None:
+                if compile_none:
+                    compiled[key] = None
+            elif value:
+                compiled[key] = (
+                    str(value) if isinstance(value, ReferencePath) else value
+                )
         return compiled
 
     @abstractmethod
@@ -96,15 +113,36 @@ class AbstractState(ABC):
         self.next_state = other
         return other
 
-    def __iter__(self) -> AbstractState:
-        """Iterate through the states."""
-        self._current: Optional[AbstractState] = self
-        return self._current
+    def __iter__(self) -> Iterator[AbstractState]:
+        """Iterate through the states by following the next states.
+
+        Each state is only visited once so that transitions which loop back to
+        an earlier state don't iterate forever.
+
+        Yields:
+            The states starting from this state.
+        """
+        visited: Set[AbstractState] = set()
+        current: Optional[AbstractState] = self
+        while current is not None and current not in visited:
+            visited.add(current)
+            yield current
+            current = current.next_state
 
     def __next__(self) -> AbstractState:
-        """Get the next state."""
-        current = self._current
-        if not current:
+        """Get the next state.
+
+        Kept for code that calls `next()` on a state directly. Unlike iterating
+        the state, this follows transitions that loop back to an earlier state.
+
+        Raises:
+            StopIteration: Raised when there are no more states.
+
+        Returns:
+            The next state, starting from this state.
+        """
+        current: Optional[AbstractState] = getattr(self, "_current", self)
+        if current is None:
             raise StopIteration
 
         self._current = current.next_state
@@ -140,6 +178,11 @@ class AbstractInputPathOutputPathState(AbstractState):
     a state by using Reference Paths.
     """
 
+    _compiled_fields = AbstractState._compiled_fields + (
+        ("InputPath", "input_path", False),
+        ("OutputPath", "output_path", False),
+    )
+
     def __init__(
         self, *args: Any, input_path: str = "$", output_path: str = "$", **kwargs: Any
     ):
@@ -192,42 +235,33 @@ class AbstractInputPathOutputPathState(AbstractState):
         )
         return state_output
 
-    def compile(self) -> Dict[str, Any]:  # noqa: A003
-        """Compile the state to Amazon States Language.
-
-        Returns:
-            A dictionary representing the compiled state in Amazon States
-            Language.
-        """
-        compiled = super().compile()
-        if input_path := self.input_path:
-            compiled["InputPath"] = str(input_path)
-        if output_path := self.output_path:
-            compiled["OutputPath"] = str(output_path)
-        return compiled
-
 
 class AbstractNextOrEndState(AbstractInputPathOutputPathState):
     """An Amazon States Language state including Next or End."""
 
-    def compile(self) -> Dict[str, Any]:  # noqa: A003
-        """Compile the state to Amazon States Language.
+    _compiled_fields = AbstractInputPathOutputPathState._compiled_fields + (
+        ("Next", "_next_state_name", False),
+        ("End", "_end", False),
+    )
 
-        Returns:
-            A dictionary representing the compiled state in Amazon States
-            Language.
-        """
-        compiled = super().compile()
-        if next_state := self.next_state:
-            compiled["Next"] = next_state.name
-        else:
-            compiled["End"] = True
-        return compiled
+    @property
+    def _next_state_name(self) -> Optional[str]:
+        """The name of the next state to compile as Next, if any."""
+        return self.next_state.name if self.next_state else None
+
+    @property
+    def _end(self) -> bool:
+        """Whether to compile End, which is when there is no next state."""
+        return self.next_state is None
 
 
 class AbstractResultPathState(AbstractNextOrEndState):
     """An Amazon States Language state including ResultPath."""
 
+    _compiled_fields = AbstractNextOrEndState._compiled_fields + (
+        ("ResultPath", "result_path", True),
+    )
+
     def __init__(self, *args: Any, result_path: Optional[str] = "$", **kwargs: Any):
         """Initialize subclasses.
 
@@ -242,18 +276,6 @@ class AbstractResultPathState(AbstractNextOrEndState):
         super().__init__(*args, **kwargs)
         self.result_path = ReferencePath(result_path) if result_path else None
 
-    def compile(self) -> Dict[str, Any]:  # noqa: A003
-        """Compile the state to Amazon States Language.
-
-        Returns:
-            A dictionary representing the compiled state in Amazon States
-            Language.
-        """
-        compiled = super().compile()
-        if self.result_path is None or self.result_path:
-            compiled["ResultPath"] = str(self.result_path) if self.result_path else None
-        return compiled
-
     def simulate(self, state_input: Any, resource_to_mock_fn: ResourceToMockFn) -> Any:
         """Simulate the state including input and output processing.
 
@@ -364,6 +386,11 @@ class AbstractResultSelectorState(AbstractParametersState):
                 raise
 
         self.result_selector = result_selector
+        # Output key (without ".$") and Reference Path for each selected value
+        self._result_selector_items: Tuple[Tuple[str, ReferencePath], ...] = tuple(
+            (key[:-2], ReferencePath(reference_path))
+            for key, reference_path in (result_selector or {}).items()
+        )
 
     @staticmethod
     def _validate_result_selector(result_selector: Dict[str, str]) -> None:
@@ -382,7 +409,8 @@ class AbstractResultSelectorState(AbstractParametersState):
                     "All resource selector keys must end with .$"
                 )
 
-            # TODO: Check if ReferencePath(...) is being called twice
+            # Validates the path; the instance is shared with
+            # _result_selector_items, so it is only built once
             ReferencePath(reference_path)
 
     def compile(self) -> Dict[str, Any]:  # noqa: A003
@@ -430,9 +458,8 @@ class AbstractResultSelectorState(AbstractParametersState):
             The filtered state output.
         """
         new_state_output = {}
-        for key, reference_path in self.result_selector.items():  # type: ignore
-            key = key[:-2]  # Strip ".$"
-            if extracted := ReferencePath(reference_path).apply(state_output):
+        for key, reference_path in self._result_selector_items:
+            if extracted := reference_path.apply(state_output):
                 new_state_output[key] = extracted
 
         return new_state_output
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC
 from enum import Enum
-from typing import Any, List, Union
+from typing import Any, Callable, List, Union
 
 from awsstepfuncs.abstract_state import AbstractState
 from awsstepfuncs.errors import AWSStepFuncsValueError
@@ -94,6 +94,8 @@ class ChoiceRule:
         Raises:
             AWSStepFuncsValueError: Raised when there is not exactly one data-test
                 expression defined.
+            AWSStepFuncsValueError: Raised when the data-test expression type
+                cannot be simulated yet.
         """
         self.variable = ReferencePath(variable)
 
@@ -106,6 +108,15 @@ class ChoiceRule:
             *list(data_test_expression.items())[0]
         )
 
+        # Look the evaluator up once instead of on every evaluation; Path
+        # expressions also need the data to resolve their Reference Path
+        expression_type = self.data_test_expression.type
+        evaluate_expression = getattr(self, f"_{expression_type}", None)
+        if evaluate_expression is None:
+            raise AWSStepFuncsValueError(f"{expression_type} cannot be simulated yet")
+        self._evaluate_expression: Callable[..., bool] = evaluate_expression
+        self._evaluate_with_data = "path" in expression_type
+
     def __repr__(self) -> str:
         """Return a string representation of the Choice Rule.
 
@@ -128,10 +139,10 @@ class ChoiceRule:
         if variable_value is None:
             return False
 
-        if "path" in self.data_test_expression.type:
-            return eval(f"self._{self.data_test_expression.type}(data, variable_value)")
+        if self._evaluate_with_data:
+            return self._evaluate_expression(data, variable_value)
         else:
-            return eval(f"self._{self.data_test_expression.type}(variable_value)")
+            return self._evaluate_expression(variable_value)
 
     def _is_present(self, variable_value: Any) -> bool:
         return variable_value is not None
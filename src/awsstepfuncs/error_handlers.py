@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from abc import ABC
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union
 
@@ -18,10 +19,11 @@ class AbstractErrorHandler(ABC):
         Args:
             error_equals: A list of error names.
         """
+        # Custom error names are interned to match the names raised by Fail States
         self.error_equals: List[Union[str, Type[StateSimulationError]]] = [
             error_class
             if (error_class := StateSimulationError.from_string(error_string))
-            else error_string
+            else sys.intern(error_string)
             for error_string in error_equals
         ]
 
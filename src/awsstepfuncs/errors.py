@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from typing import Optional, Type
 
 
@@ -112,7 +113,8 @@ class FailStateError(StateSimulationError):
             error: An error string representing the error.
             cause: A human-readable description of the error.
         """
-        self.error_string = error
+        # Interned to match the error names of catchers
+        self.error_string = sys.intern(error)
         self.cause = cause
 
     def __repr__(self) -> str:
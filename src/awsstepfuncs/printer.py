@@ -1,5 +1,5 @@
 from enum import Enum, auto
-from typing import Any, List, Optional
+from typing import Any, List, Optional, TextIO
 
 from colorama import Fore as ColoramaColor
 from colorama import Style as ColoramaStyle
@@ -37,15 +37,17 @@ class Style(Enum):
 
 
 class Printer:
-    """Print simulation messages to STDOUT."""
+    """Print simulation messages to STDOUT (or another text stream)."""
 
-    def __init__(self, colorful: bool = False):
+    def __init__(self, colorful: bool = False, file: Optional[TextIO] = None):
         """Initialize a Printer.
 
         Args:
             colorful: Whether or not to use colorful STDOUT. Defaults to False.
+            file: The text stream to write to. Defaults to the current STDOUT.
         """
         self.colorful = colorful
+        self.file = file
 
     def __call__(
         self,
@@ -66,7 +68,7 @@ class Printer:
         if self.colorful:  # pragma: no cover
             self._make_colorful(to_print, color=color, style=style, emoji=emoji)
 
-        print(*to_print)
+        print(*to_print, file=self.file)
 
     @staticmethod
     def _make_colorful(
@@ -1,9 +1,116 @@
-from typing import Any
-
-from jsonpath_rw import parse as parse_jsonpath
+import re
+from typing import Any, ClassVar, Dict, List, Tuple, Union
 
 from awsstepfuncs.errors import AWSStepFuncsValueError
 
+# A key or list index selected by one step of a Reference Path
+Step = Union[str, int]
+
+# JSONPath operators that Amazon States Language does not support
+UNSUPPORTED_OPERATOR_PATTERN = re.compile(r"@|\.\.|[,:?*]")
+
+# A list index, which counts from the end of the list when negative
+INDEX_PATTERN = re.compile(r"-?[0-9]+")
+
+
+def _read_quoted_field(reference_path: str, position: int) -> Tuple[str, int]:
+    """Read a quoted field (with backslash escapes) from a Reference Path.
+
+    Args:
+        reference_path: The Reference Path string to read from (a JSONPath).
+        position: The position of the opening quote.
+
+    Raises:
+        AWSStepFuncsValueError: Raised when the quote is never closed.
+
+    Returns:
+        The field and the position right after the closing quote.
+    """
+    quote = reference_path[position]
+    field: List[str] = []
+    position += 1
+    while position < len(reference_path):
+        char = reference_path[position]
+        if char == quote:
+            return "".join(field), position + 1
+        if char == "\\":
+            position += 1
+            if position == len(reference_path):
+                break
+            char = reference_path[position]
+        field.append(char)
+        position += 1
+    raise AWSStepFuncsValueError(f'Malformed Reference Path: "{reference_path}"')
+
+
+def _parse_steps(reference_path: str) -> Tuple[Step, ...]:
+    """Split a Reference Path into the keys and indices it selects.
+
+    Supports ".field" and "[field]" (with backslash escapes), ".'field'" and
+    "['field']" (with backslash escapes inside the quotes) and "[index]"
+    (counting from the end when negative). Whitespace between steps is
+    ignored, as in JSONPath.
+
+    Args:
+        reference_path: The Reference Path string to parse (a JSONPath).
+
+    Raises:
+        AWSStepFuncsValueError: Raised when the Reference Path cannot be split
+            into steps, such as when it uses the "$" or named (`this`,
+            `parent`) JSONPath operators after the start.
+
+    Returns:
+        The keys and list indices to follow from the root, in order.
+    """
+    malformed = f'Malformed Reference Path: "{reference_path}"'
+    steps: List[Step] = []
+    position, end = 1, len(reference_path)  # Skip the leading "$"
+    while position < end:
+        char = reference_path[position]
+        if char.isspace():
+            position += 1
+            continue
+        if char not in ".[":
+            raise AWSStepFuncsValueError(malformed)
+
+        closing_chars = ".[" if char == "." else "]"
+        position += 1
+        while position < end and reference_path[position].isspace():
+            position += 1
+        if position < end and reference_path[position] in "'\"":
+            field, position = _read_quoted_field(reference_path, position)
+            steps.append(field)
+        else:
+            chars: List[str] = []
+            while (
+                position < end
+                and (char := reference_path[position]) not in closing_chars
+                and not char.isspace()
+            ):
+                if char == "\\":
+                    position += 1
+                    if position == end:
+                        raise AWSStepFuncsValueError(malformed)
+                    char = reference_path[position]
+                elif char in "$`":
+                    raise AWSStepFuncsValueError(malformed)
+                chars.append(char)
+                position += 1
+            if not chars:
+                raise AWSStepFuncsValueError(malformed)
+            field = "".join(chars)
+            is_index = closing_chars == "]" and INDEX_PATTERN.fullmatch(field)
+            steps.append(int(field) if is_index else field)
+
+        if closing_chars == "]":
+            while position < end and reference_path[position].isspace():
+                position += 1
+            if position == end or reference_path[position] != "]":
+                raise AWSStepFuncsValueError(malformed)
+            position += 1
+
+    return tuple(steps)
+
 
 class ReferencePath:
     """Reference Path validation and application.
@@ -15,24 +122,55 @@ class ReferencePath:
     More on JSONPath: https://github.com/json-path/JsonPath
     """
 
-    def __init__(self, reference_path: str, /):
+    # Unbounded: a state machine only ever uses the paths in its definition.
+    # Plain dict operations are atomic, so no lock is needed
+    _instances: ClassVar[Dict[str, "ReferencePath"]] = {}
+
+    reference_path: str
+    _steps: Tuple[Step, ...]
+
+    def __new__(cls, reference_path: str, /) -> "ReferencePath":
         """Initialize a Reference Path.
 
+        Reference Paths are immutable, so identical strings share one validated
+        instance instead of being validated and parsed again.
+
         >>> reference_path = ReferencePath("$.detail.sum")
         >>> reference_path.apply({"show": True, "detail": {"mean": 10.4, "sum": 2000}})
         2000
+        >>> ReferencePath("$.detail.sum") is reference_path
+        True
 
         Args:
             reference_path: The Reference Path string to use (a JSONPath).
 
         Raises:
             AWSStepFuncsValueError: Raised when the Reference Path is malformed.
+
+        Returns:
+            The Reference Path.
         """
-        self.reference_path = reference_path or "$"
-        try:
-            self._validate()
-        except AWSStepFuncsValueError:
-            raise
+        reference_path = reference_path or "$"
+        # "$" is falsy, so compare against None to find it in the cache too
+        if (instance := cls._instances.get(reference_path)) is not None:
+            return instance
+
+        instance = super().__new__(cls)
+        instance.reference_path = reference_path
+        # Only valid Reference Paths are cached
+        instance._validate()
+        instance._steps = _parse_steps(reference_path)
+
+        return cls._instances.setdefault(reference_path, instance)
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        """Copy and pickle through the constructor so the instance is shared."""
+        return type(self), (self.reference_path,)
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Forget every cached Reference Path."""
+        cls._instances.clear()
 
     def __repr__(self) -> str:
         """Return the string representation of the class.
@@ -73,23 +211,29 @@ class ReferencePath:
         if not self.reference_path or str(self.reference_path)[0] != "$":
             raise AWSStepFuncsValueError('Reference Path must begin with "$"')
 
-        unsupported_operators = {"@", "..", ",", ":", "?", "*"}
-        for operator in unsupported_operators:
-            if operator in str(self.reference_path):
-                raise AWSStepFuncsValueError(
-                    f'Unsupported Reference Path operator: "{operator}"'
-                )
+        if match := UNSUPPORTED_OPERATOR_PATTERN.search(self.reference_path):
+            raise AWSStepFuncsValueError(
+                f'Unsupported Reference Path operator: "{match[0]}"'
+            )
 
     def apply(self, data: dict) -> Any:
-        """Parse then apply a Reference Path on some data.
+        """Apply a Reference Path on some data.
 
         Args:
             data: The data to use the Reference Path expression on.
 
         Returns:
-            The queried data.
+            The queried data, or None if the Reference Path does not match.
         """
-        parsed_reference_path = parse_jsonpath(self.reference_path)
-        if matches := [match.value for match in parsed_reference_path.find(data)]:
-            assert len(matches) == 1, "There should only be one match possible"
-            return matches[0]
+        value: Any = data
+        for step in self._steps:
+            if isinstance(step, int):
+                # Strings can be indexed like lists, as in JSONPath
+                if not isinstance(value, (list, str)) or not (
+                    -len(value) <= step < len(value)
+                ):
+                    return None
+            elif not isinstance(value, dict) or step not in value:
+                return None
+            value = value[step]
+        return value
@@ -49,9 +49,34 @@ from awsstepfuncs.reference_path import ReferencePath
 from awsstepfuncs.state_machine import StateMachine
 from awsstepfuncs.types import ResourceToMockFn
 
+try:
+    from ciso8601 import parse_datetime
+except ImportError:  # pragma: no cover
+    parse_datetime = None  # type: ignore
+
 MAX_STATE_NAME_LENGTH = 128
 
 
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parse a timestamp, with ciso8601 if it is installed.
+
+    Timestamps that ciso8601 cannot parse (it only parses ISO-8601) are parsed by
+    dateutil, so installing ciso8601 doesn't change which timestamps can be used.
+
+    Args:
+        timestamp: The timestamp to parse.
+
+    Returns:
+        The parsed timestamp.
+    """
+    if parse_datetime is not None:
+        try:
+            return parse_datetime(timestamp)
+        except ValueError:
+            pass
+    return dateutil.parser.parse(timestamp)
+
+
 class TerminalStateMixin(ABC):
     """A mixin for blocking rshift for terminal states."""
 
@@ -344,7 +369,7 @@ class WaitState(AbstractNextOrEndState):
 
         elif (timestamp_path := self.timestamp_path) is not None:
             timestamp = timestamp_path.apply(state_input)
-            dt = dateutil.parser.parse(timestamp)
+            dt = _parse_timestamp(timestamp)
             self._wait_for_timestamp(dt)
 
         return state_input
@@ -520,7 +545,7 @@ class MapState(AbstractRetryCatchState):
         """
         super().__init__(*args, **kwargs)
         self.iterator = iterator
-        self.items_path = items_path
+        self.items_path = ReferencePath(items_path)
         self.max_concurrency = max_concurrency
 
     def compile(self) -> Dict[str, Any]:  # noqa: A003
@@ -531,7 +556,7 @@ class MapState(AbstractRetryCatchState):
             Language.
         """
         compiled = super().compile()
-        compiled["ItemsPath"] = self.items_path
+        compiled["ItemsPath"] = str(self.items_path)
         compiled["MaxConcurrency"] = self.max_concurrency
         compiled["Iterator"] = self.iterator.compile()
         return compiled
@@ -552,7 +577,7 @@ class MapState(AbstractRetryCatchState):
             The output of the state by running the iterator state machine for
             all items.
         """
-        items = ReferencePath(self.items_path).apply(state_input)
+        items = self.items_path.apply(state_input)
         self.print(
             f"Items after applying items_path of {self.items_path}: {items}",
             style=Style.DIM,
@@ -563,6 +588,10 @@ class MapState(AbstractRetryCatchState):
         state_output = []
         for item in items:
             state_output.append(
-                self.iterator.simulate(item, resource_to_mock_fn=resource_to_mock_fn)
+                self.iterator.simulate(
+                    item,
+                    resource_to_mock_fn=resource_to_mock_fn,
+                    file=self.print.file,
+                )
             )
         return state_output
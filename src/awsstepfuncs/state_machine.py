@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional, Set, Tuple, Union
+from typing import Any, Dict, Optional, Set, TextIO, Tuple, Union
 
 from awsstepfuncs.abstract_state import AbstractRetryCatchState, AbstractState, Catcher
 from awsstepfuncs.errors import AWSStepFuncsValueError, StateSimulationError
 from awsstepfuncs.printer import Color, Printer, Style
 from awsstepfuncs.types import ResourceToMockFn
-from awsstepfuncs.visualization import Visualization
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 CompiledState = Dict[str, Union[str, bool, Dict[str, str], None]]
 
@@ -52,26 +56,22 @@ class StateMachine:
     def all_states(self) -> Set[AbstractState]:
         """Return all states in the state machine.
 
-        Returns:
-            A set of all possible states in the state machine.
-        """
-        return self._all_states_recursive(self.start_state)
-
-    def _all_states_recursive(self, start_state: AbstractState) -> Set[AbstractState]:
-        """Return all states from the given starting state.
-
-        Args:
-            start_state: The starting state.
+        States reachable through catchers are included. Each state is only
+        walked once, even when several catchers share a next state.
 
         Returns:
-            All possible states from the given starting state.
+            A set of all possible states in the state machine.
         """
-        all_states = set()
-        for state in start_state:
-            all_states.add(state)
-            if isinstance(state, AbstractRetryCatchState):
-                for catcher in state.catchers:
-                    all_states |= self._all_states_recursive(catcher.next_state)
+        all_states: Set[AbstractState] = set()
+        to_visit = [self.start_state]
+        while to_visit:
+            for state in to_visit.pop():
+                if state in all_states:
+                    # The rest of this chain has already been collected
+                    break
+                all_states.add(state)
+                if isinstance(state, AbstractRetryCatchState):
+                    to_visit.extend(catcher.next_state for catcher in state.catchers)
         return all_states
 
     def _has_unique_names(self) -> bool:
@@ -82,8 +82,12 @@ class StateMachine:
         Returns:
             Whether all states have unique names.
         """
-        all_state_names = [state.name for state in self.all_states]
-        return len(all_state_names) == len(set(all_state_names))
+        seen_names: Set[str] = set()
+        for state in self.all_states:
+            if state.name in seen_names:
+                return False
+            seen_names.add(state.name)
+        return True
 
     def compile(self) -> Dict[str, Any]:  # noqa: A003
         """Compile a state machine to Amazon States Language.
@@ -107,12 +111,21 @@ class StateMachine:
     def to_json(self, filename: Union[str, Path]) -> None:
         """Compile to Amazon States Language and then output to JSON.
 
+        If `orjson` is installed, it's used to serialize the JSON, which is
+        written compactly and without escaping non-ASCII characters. Otherwise,
+        the standard library `json` module writes it with its default
+        formatting.
+
         Args:
             filename: The name of the file to write the JSON to.
         """
         filename = Path(filename)
-        with filename.open("w") as fp:
-            json.dump(self.compile(), fp)
+        compiled = self.compile()
+        if orjson is not None:
+            filename.write_bytes(orjson.dumps(compiled))
+        else:
+            with filename.open("w") as fp:
+                json.dump(compiled, fp)
 
     def simulate(  # noqa: CCR001
         self,
@@ -122,7 +135,11 @@ class StateMachine:
         resource_to_mock_fn: ResourceToMockFn = None,
         show_visualization: bool = False,
         visualization_output_path: str = "state_machine.gif",
+        visualization_cache_dir: Optional[Union[str, Path]] = None,
+        visualization_tmp_dir: Optional[Union[str, Path]] = None,
+        visualization_engine: Optional[str] = None,
         colorful: bool = False,
+        file: Optional[TextIO] = None,
     ) -> Any:
         """Simulate the state machine by executing all of the states.
 
@@ -134,8 +151,20 @@ class StateMachine:
                 visualization of the state machine when simulating. Outputs to
                 `state_machine.gif`.
             visualization_output_path: If show_visualization is set to `True`,
-                what path to save the visualization GIF to.
+                what path to save the visualization to. Use a `.png` extension
+                to save an animated PNG instead of a GIF.
+            visualization_cache_dir: If show_visualization is set to `True`, a
+                directory to cache rendered visualizations in. By default,
+                nothing is cached.
+            visualization_tmp_dir: If show_visualization is set to `True`, a
+                scratch directory to write the GIF frames to when Pillow is not
+                installed. By default, a temporary directory is used.
+            visualization_engine: If show_visualization is set to `True`, the
+                Graphviz layout engine to use. By default, it is picked based on
+                the size of the state machine.
             colorful: Whether to make the simulation STDOUT messages ✨pop✨.
+            file: The text stream to write simulation messages to. Defaults
+                to the current STDOUT.
 
         Returns:
             The final output state from simulating the state machine.
@@ -148,11 +177,17 @@ class StateMachine:
 
         visualization = None
         if show_visualization:
+            # Imported here so compiling and plain simulations don't load the
+            # rendering dependencies
+            from awsstepfuncs.visualization import Visualization
+
             visualization = Visualization(
-                start_state=self.start_state, output_path=visualization_output_path
+                start_state=self.start_state,
+                output_path=visualization_output_path,
+                cache_dir=visualization_cache_dir,
             )
 
-        self.print = Printer(colorful=colorful)
+        self.print = Printer(colorful=colorful, file=file)
 
         current_data = state_input
         current_state: Optional[AbstractState] = self.start_state
@@ -185,7 +220,9 @@ class StateMachine:
             self.print("State output:", current_data, style=Style.DIM)
 
         if visualization:
-            visualization.render()
+            visualization.render(
+                tmp_dir=visualization_tmp_dir, engine=visualization_engine
+            )
 
         self.print(
             "Terminating simulation of state machine", color=Color.YELLOW, emoji="😴"
@@ -1,12 +1,32 @@
+import hashlib
 import os
+import shutil
+import subprocess
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+from functools import partial
+from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Optional, Union
+from typing import ContextManager, Dict, List, Optional, Set, Tuple, Union
 
 import gvanim
 
-from awsstepfuncs.abstract_state import AbstractState
+from awsstepfuncs.abstract_state import AbstractRetryCatchState, AbstractState
 from awsstepfuncs.errors import AWSStepFuncsValueError
+from awsstepfuncs.state import ChoiceState
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None  # type: ignore
+
+CACHE_TTL = timedelta(weeks=4)
+FRAME_DURATION_MS = 500
+MAX_DOT_NODES = 50
 
 
 class Visualization:
@@ -134,78 +154,361 @@ class Visualization:
         *,
         start_state: AbstractState,
         output_path: Union[str, Path] = "state_machine.gif",
+        cache_dir: Optional[Union[str, Path]] = None,
     ):
         """Initialize a state machine visualization.
 
         Make sure that if you specify the output path for the visualization that it
-        ends with `.gif`; otherwise, there will be an error.
+        ends with `.gif` or `.png`; otherwise, there will be an error. A `.png`
+        output path creates an animated PNG (APNG), which requires Pillow.
+        Without Pillow, GIFs are assembled by ImageMagick.
 
         Args:
             start_state: The starting state of the state machine, used to
                 determine all possible state transitions.
-            output_path: What path to save the visualization GIF to.
+            output_path: What path to save the visualization to.
+            cache_dir: A directory to cache rendered visualizations in, which
+                is created if needed. By default, nothing is cached.
 
         Raises:
-            AWSStepFuncsValueError: Raised when the output path doesn't end with `.gif`.
+            AWSStepFuncsValueError: Raised when the output path doesn't end with
+                `.gif` or `.png`.
+            ImportError: Raised when the output path ends with `.png` and Pillow
+                is not installed.
         """
-        self.animation = gvanim.Animation()
-        self._build_state_graph(start_state)
-
-        if not str(output_path).endswith(".gif"):
+        if not str(output_path).endswith((".gif", ".png")):
             raise AWSStepFuncsValueError(
-                'Visualization output path must end with ".gif"'
+                'Visualization output path must end with ".gif" or ".png"'
+            )
+        if str(output_path).endswith(".png") and Image is None:
+            raise ImportError(
+                "Pillow is required to save an animated PNG; install it with "
+                "`pip install awsstepfuncs[pillow]`"
             )
 
         self.output_path = Path(output_path)
+        self._cache_dir = None if cache_dir is None else Path(cache_dir)
+        self._start_state = start_state
+        self._animation: Optional[gvanim.Animation] = None
+        self._visited: Set[int] = set()
+        self._edges: Set[Tuple[str, str]] = set()
+        self._last_transition: Optional[Tuple[str, str]] = None
+        # How many extra times each step is shown for repeated transitions
+        self._step_repeats: Dict[int, int] = {}
+
+    @property
+    def animation(self) -> gvanim.Animation:
+        """The animation of the state machine graph.
+
+        The graph is only built the first time the animation is needed.
+
+        Returns:
+            The animation.
+        """
+        if self._animation is None:
+            self._animation = gvanim.Animation()
+            self._add_state_graph(self._start_state)
+        return self._animation
+
+    def add_subgraph(self, state: AbstractState) -> None:
+        """Add the transitions of a state that changed after the graph was built.
 
-    def _build_state_graph(self, start_state: AbstractState) -> None:  # noqa: CCR001
-        """Add all the possible state transitions to the graph.
+        Use this after adding a catcher or otherwise changing the transitions
+        of a state instead of creating a new visualization. Only the states
+        that were not already in the graph are walked.
 
         Args:
-            start_state: The starting state of the state machine, used to
-                determine all possible state transitions.
+            state: The state whose transitions changed.
         """
-        self.animation.add_node(start_state.name)
-        current_state: Optional[AbstractState] = start_state
-        while current_state is not None:
-            if current_state.next_state is not None:
-                self.animation.add_edge(
-                    current_state.name, current_state.next_state.name
-                )
-            elif hasattr(current_state, "choices"):
-                for choice in current_state.choices:  # type: ignore
-                    self.animation.add_edge(current_state.name, choice.next_state.name)
-                    self._build_state_graph(choice.next_state)
+        if self._animation is None:
+            # The graph will be built with the change included
+            return
+        self._add_state_graph(state)
+
+    def _add_state_graph(self, start_state: AbstractState) -> None:
+        """Add the transitions reachable from a state to the animation.
+
+        Args:
+            start_state: The state to start walking from.
+        """
+        nodes, edges = self._collect_state_graph(
+            start_state, visited=self._visited, seen_edges=self._edges
+        )
+        for node in nodes:
+            self.animation.add_node(node)
+        for edge in edges:
+            self.animation.add_edge(*edge)
 
-                if default := current_state.default:  # type: ignore
-                    self.animation.add_edge(current_state.name, default.name)
-                    self._build_state_graph(default)
+    @staticmethod
+    def _neighbors(state: AbstractState) -> List[AbstractState]:
+        """Get the states that a state can transition to.
 
-            if hasattr(current_state, "catchers"):
-                for catcher in current_state.catchers:  # type: ignore
-                    self.animation.add_edge(current_state.name, catcher.next_state.name)
-                    self._build_state_graph(catcher.next_state)
+        Args:
+            state: The state to get the possible next states of.
+
+        Returns:
+            The possible next states, including the targets of any catchers.
+        """
+        next_states: List[AbstractState] = []
+        if state.next_state is not None:
+            next_states.append(state.next_state)
+        elif isinstance(state, ChoiceState):
+            next_states.extend(choice.next_state for choice in state.choices)
+            if default := state.default:
+                next_states.append(default)
+
+        if isinstance(state, AbstractRetryCatchState):
+            next_states.extend(catcher.next_state for catcher in state.catchers)
+
+        return next_states
+
+    @classmethod
+    def _collect_state_graph(
+        cls,
+        start_state: AbstractState,
+        *,
+        visited: Set[int],
+        seen_edges: Set[Tuple[str, str]],
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Collect the possible state transitions that are not known yet.
+
+        The states are walked breadth-first and each state is only visited
+        once, so states that can be reached from several other states (such as
+        a shared catcher) are not walked again. The start state is always
+        walked so that new transitions from it are found.
+
+        Args:
+            start_state: The state to start walking from, used to determine
+                all possible state transitions.
+            visited: The ids of the states that have already been walked,
+                updated in place.
+            seen_edges: The transitions that have already been found, updated
+                in place.
+
+        Returns:
+            The names of the newly reachable states and the new transitions
+            between them, in the order they were found.
+        """
+        nodes: List[str] = []
+        # States are tracked by identity; names are only needed for the graph
+        if id(start_state) not in visited:
+            visited.add(id(start_state))
+            nodes.append(start_state.name)
+        edges: List[Tuple[str, str]] = []
+        queue = deque([start_state])
+        while queue:
+            current_state = queue.popleft()
+            name = current_state.name
+            for next_state in cls._neighbors(current_state):
+                next_name = next_state.name
+                edge = (name, next_name)
+                if edge not in seen_edges:
+                    seen_edges.add(edge)
+                    edges.append(edge)
+                if id(next_state) not in visited:
+                    visited.add(id(next_state))
+                    nodes.append(next_name)
+                    queue.append(next_state)
+
+        return nodes, edges
+
+    def render(
+        self,
+        tmp_dir: Optional[Union[str, Path]] = None,
+        *,
+        engine: Optional[str] = None,
+    ) -> None:
+        """Render the state machine visualization to a GIF or APNG file.
+
+        If a cache directory is set, rendered visualizations are cached there
+        for four weeks, so rendering the same animation again only copies the
+        cached file. Frames that are identical (such as when a loop highlights the
+        same states again) are only rendered once.
 
-            current_state = current_state.next_state
+        Frames are rendered in parallel and encoded with Pillow in memory. If
+        Pillow is not installed, GIF frames are written to disk and assembled
+        by ImageMagick instead.
 
-    def render(self) -> None:
-        """Render the state machine visualization to a GIF file."""
+        Args:
+            tmp_dir: A scratch directory to write the GIF frames to when Pillow
+                is not installed, which is created if needed and left in place
+                so it can be reused. By default, a temporary directory is
+                created and removed for each render.
+            engine: The Graphviz layout engine to use, such as `dot` or `sfdp`.
+                By default, large graphs are laid out with `sfdp` and the rest
+                with `dot`, which gets slow on graphs with many nodes.
+        """
         graphs = self.animation.graphs()
+        repeats = [1 + self._step_repeats.get(step, 0) for step in range(len(graphs))]
+        if engine is None:
+            engine = "sfdp" if len(self._visited) > MAX_DOT_NODES else "dot"
+        if self._cache_dir is None:
+            self._render_graphs(graphs, repeats, engine=engine, tmp_dir=tmp_dir)
+            return
+
+        key = hashlib.blake2b(
+            "\n".join([engine, str(repeats), *graphs]).encode(), digest_size=16
+        ).hexdigest()
+        cached_path = self._cache_dir / f"{key}{self.output_path.suffix}"
+        self._evict_expired_cache_entries(self._cache_dir)
+        try:
+            shutil.copyfile(cached_path, self.output_path)
+            return
+        except OSError:
+            pass  # Not cached yet
+
+        self._render_graphs(graphs, repeats, engine=engine, tmp_dir=tmp_dir)
+        # The copy is moved into place so concurrent renders never see it
+        # half-written. A partial copy left behind is evicted like any entry
+        partial_path = cached_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.output_path, partial_path)
+            os.replace(partial_path, cached_path)
+        except OSError:
+            pass  # Caching is best effort
+
+    @staticmethod
+    def _evict_expired_cache_entries(cache_dir: Path) -> None:
+        """Remove the cached visualizations that are older than the cache TTL.
+
+        Args:
+            cache_dir: The directory the visualizations are cached in.
+        """
+        expiry = time.time() - CACHE_TTL.total_seconds()
+        try:
+            paths = list(cache_dir.iterdir())
+        except OSError:
+            return  # Nothing is cached yet
+        for path in paths:
+            try:
+                if path.stat().st_mtime < expiry:
+                    path.unlink()
+            except OSError:
+                pass  # Already removed by a concurrent render
+
+    def _render_graphs(
+        self,
+        graphs: List[str],
+        repeats: List[int],
+        *,
+        engine: str,
+        tmp_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """Render the frames of the animation to the output path.
+
+        Args:
+            graphs: The frames of the animation in the DOT language.
+            repeats: How many frame durations to show each frame for.
+            engine: The Graphviz layout engine to use.
+            tmp_dir: The scratch directory to write the GIF frames to, if any.
+        """
+        unique_graphs = list(dict.fromkeys(graphs))
         size = 700
-        with TemporaryDirectory() as tmp_dir:
-            files = gvanim.render(
-                graphs, os.path.join(tmp_dir, "state_machine"), "png", size=size
+        # Each frame is rendered by its own Graphviz process, so threads are enough
+        with ThreadPoolExecutor() as executor:
+            unique_frames = list(
+                executor.map(
+                    partial(self._render_frame, size=size, engine=engine),
+                    unique_graphs,
+                )
             )
+        frame_by_graph = dict(zip(unique_graphs, unique_frames))
+        if Image is not None:
+            # Encode the animation straight from the frames in memory
+            self._save_animation(
+                [frame_by_graph[graph] for graph in graphs],
+                size=size,
+                durations=[FRAME_DURATION_MS * repeat for repeat in repeats],
+            )
+            return
+
+        # Without Pillow, the GIF is assembled by ImageMagick from frame files
+        if tmp_dir is None:
+            frames_dir_context: ContextManager = TemporaryDirectory()
+        else:
+            Path(tmp_dir).mkdir(parents=True, exist_ok=True)
+            frames_dir_context = nullcontext(tmp_dir)
+        with frames_dir_context as frames_dir:
+            file_by_graph = {}
+            for index, (graph, frame) in enumerate(frame_by_graph.items()):
+                file = os.path.join(frames_dir, f"state_machine_{index:03}.png")
+                Path(file).write_bytes(frame)
+                file_by_graph[graph] = file
+            # ImageMagick uses one delay for every frame, so repeated frames
+            # are listed again to show them for longer
+            files = [
+                file_by_graph[graph]
+                for graph, repeat in zip(graphs, repeats)
+                for _ in range(repeat)
+            ]
             # TODO: Replace with removesuffix() when dropping 3.8 support
             output_path_without_ext = str(self.output_path)[:-4]
-            gvanim.gif(files, output_path_without_ext, delay=50, size=size)
+            delay = FRAME_DURATION_MS // 10  # In hundredths of a second
+            gvanim.gif(files, output_path_without_ext, delay=delay, size=size)
+
+    @staticmethod
+    def _render_frame(graph: str, *, size: int, engine: str = "dot") -> bytes:
+        """Render a single frame of the animation to PNG in memory.
+
+        Args:
+            graph: The frame's graph in the DOT language.
+            size: The width and height of the frame in pixels.
+            engine: The Graphviz layout engine to use.
+
+        Returns:
+            The PNG image data.
+        """
+        command = [engine, "-Gsize=1,1!", f"-Gdpi={size}", "-Tpng"]
+        if engine == "sfdp":
+            # Straight edges are much faster to route on large graphs
+            command.append("-Gsplines=line")
+        return subprocess.run(
+            command, input=graph.encode(), stdout=subprocess.PIPE, check=True
+        ).stdout
+
+    def _save_animation(
+        self, frames: List[bytes], *, size: int, durations: List[int]
+    ) -> None:
+        """Save the rendered frames as an animated GIF or PNG.
+
+        The frames are centered on a white canvas so they all have the same
+        dimensions. The format follows the extension of the output path.
+
+        Args:
+            frames: The PNG image data of each rendered frame.
+            size: The width and height of the animation in pixels.
+            durations: How long to show each frame for in milliseconds.
+        """
+        images = []
+        for frame in frames:
+            with Image.open(BytesIO(frame)) as image:
+                canvas = Image.new("RGB", (size, size), "white")
+                canvas.paste(
+                    image.convert("RGB"),
+                    ((size - image.width) // 2, (size - image.height) // 2),
+                )
+                images.append(canvas)
+        images[0].save(
+            self.output_path,
+            format=self.output_path.suffix[1:].upper(),
+            save_all=True,
+            append_images=images[1:],
+            duration=durations,
+            loop=0,
+        )
 
     def highlight_state(self, state: AbstractState) -> None:
         """Highlight a state.
 
+        Highlighting the state that was just transitioned to doesn't interrupt
+        a repeated transition, such as a state that loops back to itself.
+
         Args:
             state: The state to highlight, unique by name.
         """
+        if self._last_transition and self._last_transition[1] != state.name:
+            self._last_transition = None
         self.animation.highlight_node(state.name)
 
     def highlight_state_transition(
@@ -213,10 +516,22 @@ class Visualization:
     ) -> None:
         """Highlight the transition between two states.
 
+        Highlighting the same transition again right after it was highlighted
+        would only add identical frames, so the frames of the last transition
+        are shown for longer instead.
+
         Args:
             previous_state: The previous state.
             next_state: The next state.
         """
+        transition = (previous_state.name, next_state.name)
+        if transition == self._last_transition:
+            last_step = len(self.animation.steps()) - 1
+            for step in (last_step - 1, last_step):
+                self._step_repeats[step] = self._step_repeats.get(step, 0) + 1
+            return
+        self._last_transition = transition
+
         self.animation.next_step()
-        self.animation.highlight_edge(previous_state.name, next_state.name)
+        self.animation.highlight_edge(*transition)
         self.animation.next_step()
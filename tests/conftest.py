@@ -1,15 +1,33 @@
-from contextlib import closing, redirect_stdout
-from io import StringIO
+import builtins
 
 import pytest
 
 
 @pytest.fixture()
-def capture_stdout():
+def capture_stdout(monkeypatch):
+    """Capture what gets printed while simulating.
+
+    `print` is swapped for a sink that collects the printed lines, which is
+    cheaper than redirecting STDOUT through a text stream.
+    """
+    real_print = builtins.print
+    # Shared by every capture in a test, cleared before each simulation
+    printed = []
+
+    def sink(*args, sep=None, end=None, file=None, flush=False):
+        if file is not None:
+            real_print(*args, sep=sep, end=end, file=file, flush=flush)
+            return
+        printed.append(
+            (" " if sep is None else sep).join(map(str, args))
+            + ("\n" if end is None else end)
+        )
+
     def _capture_stdout(simulate_fn):
-        with closing(StringIO()) as fp:
-            with redirect_stdout(fp):
-                simulate_fn()
-            return fp.getvalue()
+        printed.clear()
+        with monkeypatch.context() as patch:
+            patch.setattr(builtins, "print", sink)
+            simulate_fn()
+        return "".join(printed)
 
     return _capture_stdout
@@ -8,6 +8,49 @@ from awsstepfuncs import (
     VariableChoice,
 )
 
+CHOICE_STATE_STDOUT = """Starting simulation of state machine
+Executing ChoiceState('DispatchEvent')
+State input: {'type': 'Private', 'value': 22}
+State input after applying input path of $: {'type': 'Private', 'value': 22}
+State output after applying output path of $: {'type': 'Private', 'value': 22}
+State output: {'type': 'Private', 'value': 22}
+Executing PassState('ValueInTwenties')
+State input: {'type': 'Private', 'value': 22}
+State input after applying input path of $: {'type': 'Private', 'value': 22}
+Output from applying result path of $: {'type': 'Private', 'value': 22}
+State output after applying output path of $: {'type': 'Private', 'value': 22}
+State output: {'type': 'Private', 'value': 22}
+Terminating simulation of state machine
+"""
+
+DEFAULT_CHOICE_STDOUT = """Starting simulation of state machine
+Executing ChoiceState('DispatchEvent')
+State input: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
+State input after applying input path of $: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
+No choice evaluated to true
+Choosing next state by the default set
+State output after applying output path of $: {}
+State output: {}
+Executing PassState('RecordEvent')
+State input: {}
+State input after applying input path of $: {}
+Output from applying result path of $: {}
+State output after applying output path of $: {}
+State output: {}
+Terminating simulation of state machine
+"""
+
+NO_CHOICE_STDOUT = """Starting simulation of state machine
+Executing ChoiceState('DispatchEvent')
+State input: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
+State input after applying input path of $: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
+No choice evaluated to true
+NoChoiceMatchedError encountered in state
+Checking for catchers
+State output: {}
+Terminating simulation of state machine
+"""
+
 
 def test_choice_state(capture_stdout):
     # Define some states that can be conditionally transitioned to by the
@@ -49,23 +92,7 @@ def test_choice_state(capture_stdout):
     stdout = capture_stdout(
         lambda: state_machine.simulate({"type": "Private", "value": 22})
     )
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing ChoiceState('DispatchEvent')
-State input: {'type': 'Private', 'value': 22}
-State input after applying input path of $: {'type': 'Private', 'value': 22}
-State output after applying output path of $: {'type': 'Private', 'value': 22}
-State output: {'type': 'Private', 'value': 22}
-Executing PassState('ValueInTwenties')
-State input: {'type': 'Private', 'value': 22}
-State input after applying input path of $: {'type': 'Private', 'value': 22}
-Output from applying result path of $: {'type': 'Private', 'value': 22}
-State output after applying output path of $: {'type': 'Private', 'value': 22}
-State output: {'type': 'Private', 'value': 22}
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == CHOICE_STATE_STDOUT
     # If no choice evaluates to true, then the default will be chosen
 
     stdout = capture_stdout(
@@ -77,25 +104,7 @@ Terminating simulation of state machine
             }
         )
     )
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing ChoiceState('DispatchEvent')
-State input: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
-State input after applying input path of $: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
-No choice evaluated to true
-Choosing next state by the default set
-State output after applying output path of $: {}
-State output: {}
-Executing PassState('RecordEvent')
-State input: {}
-State input after applying input path of $: {}
-Output from applying result path of $: {}
-State output after applying output path of $: {}
-State output: {}
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == DEFAULT_CHOICE_STDOUT
 
     # If no choice evaluates to true and no default is set, then there will be an
     # error
@@ -132,16 +141,4 @@ Terminating simulation of state machine
             }
         )
     )
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing ChoiceState('DispatchEvent')
-State input: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
-State input after applying input path of $: {'type': 'Private', 'value': 102, 'auditThreshold': 150}
-No choice evaluated to true
-NoChoiceMatchedError encountered in state
-Checking for catchers
-State output: {}
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == NO_CHOICE_STDOUT
@@ -1,43 +1,92 @@
+from io import StringIO
+
 import pytest
 
 from awsstepfuncs import MapState, StateMachine, TaskState
 
-
-@pytest.fixture()
-def state_input():
-    return {
-        "ship-date": "2016-03-14T01:59:00Z",
-        "detail": {
-            "delivery-partner": "UQS",
-            "shipped": [
-                {"prod": "R31", "dest-code": 9511, "quantity": 1344},
-                {"prod": "S39", "dest-code": 9511, "quantity": 40},
-            ],
-        },
-    }
-
-
-@pytest.fixture()
+SHIPPED = [
+    {"prod": "R31", "dest-code": 9511, "quantity": 1344},
+    {"prod": "S39", "dest-code": 9511, "quantity": 40},
+]
+VALIDATED = [
+    {"prod": "R31", "dest-code": 9511, "quantity": 2688},
+    {"prod": "S39", "dest-code": 9511, "quantity": 80},
+]
+STATE_INPUT = {
+    "ship-date": "2016-03-14T01:59:00Z",
+    "detail": {"delivery-partner": "UQS", "shipped": SHIPPED},
+}
+
+
+def map_state_header_lines(items_path, items):
+    return [
+        "Starting simulation of state machine",
+        "Executing MapState('Validate-All')",
+        f"State input: {STATE_INPUT}",
+        f"State input after applying input path of $.detail: {STATE_INPUT['detail']}",
+        f"Items after applying items_path of {items_path}: {items}",
+    ]
+
+
+def iteration_lines(item, output):
+    return [
+        "Starting simulation of state machine",
+        "Executing TaskState('Validate')",
+        f"State input: {item}",
+        f"State input after applying input path of $: {item}",
+        f"Output from applying result path of $: {output}",
+        f"State output after applying output path of $: {output}",
+        f"State output: {output}",
+        "Terminating simulation of state machine",
+    ]
+
+
+MAP_STATE_STDOUT = "\n".join(
+    [
+        *map_state_header_lines("$.shipped", SHIPPED),
+        *iteration_lines(SHIPPED[0], VALIDATED[0]),
+        *iteration_lines(SHIPPED[1], VALIDATED[1]),
+        f"Output from applying result path of $: {VALIDATED}",
+        f"State output after applying output path of $: {VALIDATED}",
+        f"State output: {VALIDATED}",
+        "Terminating simulation of state machine",
+        "",
+    ]
+)
+
+BAD_ITEMS_PATH_STDOUT = "\n".join(
+    [
+        *map_state_header_lines("$.delivery-partner", "UQS"),
+        "StateSimulationError encountered in state",
+        "Checking for catchers",
+        "No catchers were matched",
+        "State output: {}",
+        "Terminating simulation of state machine",
+        "",
+    ]
+)
+
+
+@pytest.fixture(scope="session")
 def resource():
     return "<arn>"
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def iterator(resource):
     task_state = TaskState("Validate", resource=resource)
     return StateMachine(start_state=task_state)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def mock_fn():
     def _mock_fn(event, context):
-        event["quantity"] *= 2
-        return event
+        return {**event, "quantity": event["quantity"] * 2}
 
     return _mock_fn
 
 
-def test_map_state_foo(resource, iterator, state_input, capture_stdout, mock_fn):
+def test_map_state_foo(resource, iterator, capture_stdout, mock_fn):
     map_state = MapState(
         "Validate-All",
         input_path="$.detail",
@@ -49,40 +98,12 @@ def test_map_state_foo(resource, iterator, state_input, capture_stdout, mock_fn)
 
     stdout = capture_stdout(
         lambda: state_machine.simulate(
-            state_input,
+            STATE_INPUT,
             resource_to_mock_fn={resource: mock_fn},
         )
     )
 
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing MapState('Validate-All')
-State input: {'ship-date': '2016-03-14T01:59:00Z', 'detail': {'delivery-partner': 'UQS', 'shipped': [{'prod': 'R31', 'dest-code': 9511, 'quantity': 1344}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 40}]}}
-State input after applying input path of $.detail: {'delivery-partner': 'UQS', 'shipped': [{'prod': 'R31', 'dest-code': 9511, 'quantity': 1344}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 40}]}
-Items after applying items_path of $.shipped: [{'prod': 'R31', 'dest-code': 9511, 'quantity': 1344}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 40}]
-Starting simulation of state machine
-Executing TaskState('Validate')
-State input: {'prod': 'R31', 'dest-code': 9511, 'quantity': 1344}
-State input after applying input path of $: {'prod': 'R31', 'dest-code': 9511, 'quantity': 1344}
-Output from applying result path of $: {'prod': 'R31', 'dest-code': 9511, 'quantity': 2688}
-State output after applying output path of $: {'prod': 'R31', 'dest-code': 9511, 'quantity': 2688}
-State output: {'prod': 'R31', 'dest-code': 9511, 'quantity': 2688}
-Terminating simulation of state machine
-Starting simulation of state machine
-Executing TaskState('Validate')
-State input: {'prod': 'S39', 'dest-code': 9511, 'quantity': 40}
-State input after applying input path of $: {'prod': 'S39', 'dest-code': 9511, 'quantity': 40}
-Output from applying result path of $: {'prod': 'S39', 'dest-code': 9511, 'quantity': 80}
-State output after applying output path of $: {'prod': 'S39', 'dest-code': 9511, 'quantity': 80}
-State output: {'prod': 'S39', 'dest-code': 9511, 'quantity': 80}
-Terminating simulation of state machine
-Output from applying result path of $: [{'prod': 'R31', 'dest-code': 9511, 'quantity': 2688}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 80}]
-State output after applying output path of $: [{'prod': 'R31', 'dest-code': 9511, 'quantity': 2688}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 80}]
-State output: [{'prod': 'R31', 'dest-code': 9511, 'quantity': 2688}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 80}]
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == MAP_STATE_STDOUT
 
     assert state_machine.compile() == {
         "StartAt": "Validate-All",
@@ -104,9 +125,7 @@ Terminating simulation of state machine
     }
 
 
-def test_map_state_bad_items_path(
-    resource, iterator, state_input, capture_stdout, mock_fn
-):
+def test_map_state_bad_items_path(resource, iterator, capture_stdout, mock_fn):
     map_state = MapState(
         "Validate-All",
         input_path="$.detail",
@@ -118,22 +137,33 @@ def test_map_state_bad_items_path(
 
     stdout = capture_stdout(
         lambda: state_machine.simulate(
-            state_input,
+            STATE_INPUT,
             resource_to_mock_fn={resource: mock_fn},
         )
     )
 
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing MapState('Validate-All')
-State input: {'ship-date': '2016-03-14T01:59:00Z', 'detail': {'delivery-partner': 'UQS', 'shipped': [{'prod': 'R31', 'dest-code': 9511, 'quantity': 1344}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 40}]}}
-State input after applying input path of $.detail: {'delivery-partner': 'UQS', 'shipped': [{'prod': 'R31', 'dest-code': 9511, 'quantity': 1344}, {'prod': 'S39', 'dest-code': 9511, 'quantity': 40}]}
-Items after applying items_path of $.delivery-partner: UQS
-StateSimulationError encountered in state
-Checking for catchers
-No catchers were matched
-State output: {}
-Terminating simulation of state machine
-"""
+    assert stdout == BAD_ITEMS_PATH_STDOUT
+
+
+def test_map_state_output_file(resource, iterator, capture_stdout, mock_fn):
+    map_state = MapState(
+        "Validate-All",
+        input_path="$.detail",
+        items_path="$.shipped",
+        max_concurrency=0,
+        iterator=iterator,
     )
+    state_machine = StateMachine(start_state=map_state)
+
+    with StringIO() as fp:
+        stdout = capture_stdout(
+            lambda: state_machine.simulate(
+                STATE_INPUT,
+                resource_to_mock_fn={resource: mock_fn},
+                file=fp,
+            )
+        )
+        output = fp.getvalue()
+
+    assert stdout == ""
+    assert output == MAP_STATE_STDOUT
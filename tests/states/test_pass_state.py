@@ -1,5 +1,37 @@
 from awsstepfuncs import PassState, StateMachine
 
+PASS_STATE_STDOUT = """Starting simulation of state machine
+Executing PassState('Pass 1')
+State input: {}
+State input after applying input path of $: {}
+Output from applying result path of $: {}
+State output after applying output path of $: {}
+State output: {}
+Executing PassState('Pass 2')
+State input: {}
+State input after applying input path of $: {}
+Output from applying result path of $: {}
+State output after applying output path of $: {}
+State output: {}
+Executing PassState('Pass 3')
+State input: {}
+State input after applying input path of $: {}
+Output from applying result path of $: {}
+State output after applying output path of $: {}
+State output: {}
+Terminating simulation of state machine
+"""
+
+PASS_STATE_RESULT_STDOUT = """Starting simulation of state machine
+Executing PassState('Passing')
+State input: {}
+State input after applying input path of $: {}
+Output from applying result path of $: {'Hello': 'world!'}
+State output after applying output path of $: {'Hello': 'world!'}
+State output: {'Hello': 'world!'}
+Terminating simulation of state machine
+"""
+
 
 def test_pass_state(capture_stdout):
     pass_state1 = PassState("Pass 1", comment="The starting state")
@@ -30,30 +62,7 @@ def test_pass_state(capture_stdout):
 
     stdout = capture_stdout(lambda: state_machine.simulate())
 
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing PassState('Pass 1')
-State input: {}
-State input after applying input path of $: {}
-Output from applying result path of $: {}
-State output after applying output path of $: {}
-State output: {}
-Executing PassState('Pass 2')
-State input: {}
-State input after applying input path of $: {}
-Output from applying result path of $: {}
-State output after applying output path of $: {}
-State output: {}
-Executing PassState('Pass 3')
-State input: {}
-State input after applying input path of $: {}
-Output from applying result path of $: {}
-State output after applying output path of $: {}
-State output: {}
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == PASS_STATE_STDOUT
 
 
 def test_pass_state_result(capture_stdout):
@@ -70,15 +79,4 @@ def test_pass_state_result(capture_stdout):
 
     stdout = capture_stdout(lambda: state_machine.simulate())
 
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing PassState('Passing')
-State input: {}
-State input after applying input path of $: {}
-Output from applying result path of $: {'Hello': 'world!'}
-State output after applying output path of $: {'Hello': 'world!'}
-State output: {'Hello': 'world!'}
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == PASS_STATE_RESULT_STDOUT
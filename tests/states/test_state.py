@@ -18,3 +18,20 @@ def test_terminal_state():
         AWSStepFuncsValueError, match="FailState cannot have a next state"
     ):
         fail_state >> pass_state
+
+
+def test_iterate_states_with_loop():
+    pass_state1 = PassState("Pass 1")
+    pass_state2 = PassState("Pass 2")
+    pass_state1 >> pass_state2 >> pass_state1
+    assert [state.name for state in pass_state1] == ["Pass 1", "Pass 2"]
+
+
+def test_next_state():
+    pass_state1 = PassState("Pass 1")
+    pass_state2 = PassState("Pass 2")
+    pass_state1 >> pass_state2
+    assert next(pass_state1) is pass_state1
+    assert next(pass_state1) is pass_state2
+    with pytest.raises(StopIteration):
+        next(pass_state1)
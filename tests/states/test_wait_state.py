@@ -1,18 +1,16 @@
-from datetime import datetime, timedelta
+from datetime import datetime
+from types import SimpleNamespace
 
 import pytest
 
 from awsstepfuncs import StateMachine, WaitState
+from awsstepfuncs import state as state_module
 from awsstepfuncs.errors import AWSStepFuncsValueError
 
+# Far enough ahead that the wait state always waits for it
+FUTURE_TIMESTAMP = datetime(2099, 1, 1)
 
-def test_wait_state(capture_stdout):
-    wait_state = WaitState("Wait!", seconds=1)
-    state_machine = StateMachine(start_state=wait_state)
-    stdout = capture_stdout(lambda: state_machine.simulate())
-    assert (
-        stdout
-        == """Starting simulation of state machine
+WAIT_STATE_STDOUT = """Starting simulation of state machine
 Executing WaitState('Wait!', seconds=1)
 State input: {}
 State input after applying input path of $: {}
@@ -21,33 +19,18 @@ State output after applying output path of $: {}
 State output: {}
 Terminating simulation of state machine
 """
-    )
-
-
-def test_negative_seconds():
-    with pytest.raises(
-        AWSStepFuncsValueError, match="seconds must be greater than zero"
-    ):
-        WaitState("Wait!", seconds=-1)
-
-
-def test_future_timestamp(capture_stdout):
-    timestamp = datetime.now() + timedelta(seconds=2)
-    wait_state = WaitState("Wait", timestamp=timestamp)
-    state_machine = StateMachine(start_state=wait_state)
-    state_input = {"foo": "bar"}
-
-    stdout = capture_stdout(lambda: state_machine.simulate(state_input))
-    assert f"Waiting until {timestamp.isoformat()}" in stdout
 
+FUTURE_TIMESTAMP_STDOUT = """Starting simulation of state machine
+Executing WaitState('Wait', timestamp='2099-01-01T00:00:00')
+State input: {'foo': 'bar'}
+State input after applying input path of $: {'foo': 'bar'}
+Waiting until 2099-01-01T00:00:00
+State output after applying output path of $: {'foo': 'bar'}
+State output: {'foo': 'bar'}
+Terminating simulation of state machine
+"""
 
-def test_past_timestamp(capture_stdout):
-    wait_state = WaitState("Wait!", timestamp=datetime(2020, 1, 1))
-    state_machine = StateMachine(start_state=wait_state)
-    stdout = capture_stdout(lambda: state_machine.simulate())
-    assert (
-        stdout
-        == """Starting simulation of state machine
+PAST_TIMESTAMP_STDOUT = """Starting simulation of state machine
 Executing WaitState('Wait!', timestamp='2020-01-01T00:00:00')
 State input: {}
 State input after applying input path of $: {}
@@ -55,16 +38,8 @@ State output after applying output path of $: {}
 State output: {}
 Terminating simulation of state machine
 """
-    )
 
-
-def test_seconds_path(capture_stdout):
-    wait_state = WaitState("Wait!", seconds_path="$.numSeconds")
-    state_machine = StateMachine(start_state=wait_state)
-    stdout = capture_stdout(lambda: state_machine.simulate({"numSeconds": 1}))
-    assert (
-        stdout
-        == """Starting simulation of state machine
+SECONDS_PATH_STDOUT = """Starting simulation of state machine
 Executing WaitState('Wait!', seconds_path='$.numSeconds')
 State input: {'numSeconds': 1}
 State input after applying input path of $: {'numSeconds': 1}
@@ -73,16 +48,8 @@ State output after applying output path of $: {'numSeconds': 1}
 State output: {'numSeconds': 1}
 Terminating simulation of state machine
 """
-    )
 
-
-def test_invalid_seconds_path(capture_stdout):
-    wait_state = WaitState("Wait!", seconds_path="$.numSeconds")
-    state_machine = StateMachine(start_state=wait_state)
-    stdout = capture_stdout(lambda: state_machine.simulate({"numSeconds": "hello"}))
-    assert (
-        stdout
-        == """Starting simulation of state machine
+INVALID_SECONDS_PATH_STDOUT = """Starting simulation of state machine
 Executing WaitState('Wait!', seconds_path='$.numSeconds')
 State input: {'numSeconds': 'hello'}
 State input after applying input path of $: {'numSeconds': 'hello'}
@@ -91,18 +58,8 @@ Checking for catchers
 State output: {}
 Terminating simulation of state machine
 """
-    )
-
 
-def test_timestamp_path(capture_stdout):
-    wait_state = WaitState("Wait!", timestamp_path="$.meta.timeToWait")
-    state_machine = StateMachine(start_state=wait_state)
-    stdout = capture_stdout(
-        lambda: state_machine.simulate({"meta": {"timeToWait": "2020-01-01T00:00:00"}})
-    )
-    assert (
-        stdout
-        == """Starting simulation of state machine
+TIMESTAMP_PATH_STDOUT = """Starting simulation of state machine
 Executing WaitState('Wait!', timestamp_path='$.meta.timeToWait')
 State input: {'meta': {'timeToWait': '2020-01-01T00:00:00'}}
 State input after applying input path of $: {'meta': {'timeToWait': '2020-01-01T00:00:00'}}
@@ -111,7 +68,83 @@ State output after applying output path of $: {'meta': {'timeToWait': '2020-01-0
 State output: {'meta': {'timeToWait': '2020-01-01T00:00:00'}}
 Terminating simulation of state machine
 """
+
+
+@pytest.fixture(autouse=True)
+def waits(monkeypatch):
+    """Record waits instead of blocking the tests on the wall clock."""
+    waits = []
+    # Stub the modules as imported by the state module, so that the real
+    # time.sleep() and pause.until() are left alone for everything else
+    monkeypatch.setattr(state_module, "time", SimpleNamespace(sleep=waits.append))
+    monkeypatch.setattr(state_module, "pause", SimpleNamespace(until=waits.append))
+    return waits
+
+
+def test_wait_state(capture_stdout, waits):
+    wait_state = WaitState("Wait!", seconds=1)
+    state_machine = StateMachine(start_state=wait_state)
+    stdout = capture_stdout(lambda: state_machine.simulate())
+    assert stdout == WAIT_STATE_STDOUT
+    assert waits == [1]
+
+
+def test_negative_seconds():
+    with pytest.raises(
+        AWSStepFuncsValueError, match="seconds must be greater than zero"
+    ):
+        WaitState("Wait!", seconds=-1)
+
+
+def test_future_timestamp(capture_stdout, waits):
+    wait_state = WaitState("Wait", timestamp=FUTURE_TIMESTAMP)
+    state_machine = StateMachine(start_state=wait_state)
+    stdout = capture_stdout(lambda: state_machine.simulate({"foo": "bar"}))
+    assert stdout == FUTURE_TIMESTAMP_STDOUT
+    assert waits == [FUTURE_TIMESTAMP]
+
+
+def test_past_timestamp(capture_stdout, waits):
+    wait_state = WaitState("Wait!", timestamp=datetime(2020, 1, 1))
+    state_machine = StateMachine(start_state=wait_state)
+    stdout = capture_stdout(lambda: state_machine.simulate())
+    assert stdout == PAST_TIMESTAMP_STDOUT
+    assert waits == []
+
+
+def test_seconds_path(capture_stdout):
+    wait_state = WaitState("Wait!", seconds_path="$.numSeconds")
+    state_machine = StateMachine(start_state=wait_state)
+    stdout = capture_stdout(lambda: state_machine.simulate({"numSeconds": 1}))
+    assert stdout == SECONDS_PATH_STDOUT
+
+
+def test_invalid_seconds_path(capture_stdout):
+    wait_state = WaitState("Wait!", seconds_path="$.numSeconds")
+    state_machine = StateMachine(start_state=wait_state)
+    stdout = capture_stdout(lambda: state_machine.simulate({"numSeconds": "hello"}))
+    assert stdout == INVALID_SECONDS_PATH_STDOUT
+
+
+def test_timestamp_path(capture_stdout):
+    wait_state = WaitState("Wait!", timestamp_path="$.meta.timeToWait")
+    state_machine = StateMachine(start_state=wait_state)
+    stdout = capture_stdout(
+        lambda: state_machine.simulate({"meta": {"timeToWait": "2020-01-01T00:00:00"}})
     )
+    assert stdout == TIMESTAMP_PATH_STDOUT
+
+
+@pytest.mark.parametrize("use_ciso8601", [True, False], ids=["ciso8601", "dateutil"])
+@pytest.mark.parametrize(
+    "timestamp", ["2020-01-01T00:00:00", "2020-01-01", "Jan 1 2020", "2020/01/01"]
+)
+def test_parse_timestamp(monkeypatch, use_ciso8601, timestamp):
+    if use_ciso8601:
+        pytest.importorskip("ciso8601")
+    else:
+        monkeypatch.setattr(state_module, "parse_datetime", None)
+    assert state_module._parse_timestamp(timestamp) == datetime(2020, 1, 1)
 
 
 def test_too_many_parameters():
@@ -119,7 +152,7 @@ def test_too_many_parameters():
         AWSStepFuncsValueError,
         match="Exactly one must be defined: seconds, timestamp, seconds_path, timestamp_path",
     ):
-        WaitState("Wait", seconds=5, timestamp=datetime.now())
+        WaitState("Wait", seconds=5, timestamp=FUTURE_TIMESTAMP)
 
 
 def test_no_parameters_set():
@@ -34,6 +34,11 @@ def test_bad_numeric_greater_than_path():
         rating_rule.evaluate({"rating": 53, "auditThreshold": "50"})
 
 
+def test_unsupported_data_test_expression():
+    with pytest.raises(AWSStepFuncsValueError, match="is_null cannot be simulated yet"):
+        ChoiceRule("$.value", is_null=True)
+
+
 def test_string_equals():
     rule = ChoiceRule("$.letter", string_equals="B")
     assert not rule.evaluate({"letter": "A"})
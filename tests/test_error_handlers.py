@@ -1,5 +1,57 @@
+import pytest
+
 from awsstepfuncs import FailState, PassState, StateMachine, SucceedState, TaskState
 
+CATCHER_MATCHED_STDOUT = """Starting simulation of state machine
+Executing TaskState('Task')
+State input: {}
+State input after applying input path of $: {}
+TaskFailedError encountered in state
+Checking for catchers
+Found catcher, transitioning to PassState('Pass')
+State output: {}
+Executing PassState('Pass')
+State input: {}
+State input after applying input path of $: {}
+Output from applying result path of $: {}
+State output after applying output path of $: {}
+State output: {}
+Executing FailState('Failure', error='IFailed', cause='I failed!')
+State input: {}
+FailStateError encountered in state
+Checking for catchers
+State output: {}
+Terminating simulation of state machine
+"""
+
+NO_CATCHER_MATCHED_STDOUT = """Starting simulation of state machine
+Executing TaskState('Task')
+State input: {}
+State input after applying input path of $: {}
+TaskFailedError encountered in state
+Checking for catchers
+No catchers were matched
+State output: {}
+Terminating simulation of state machine
+"""
+
+MULTIPLE_CATCHERS_STDOUT = """Starting simulation of state machine
+Executing TaskState('Task')
+State input: {}
+State input after applying input path of $: {}
+TaskFailedError encountered in state
+Checking for catchers
+Found catcher, transitioning to PassState('Task Failed')
+State output: {}
+Executing PassState('Task Failed')
+State input: {}
+State input after applying input path of $: {}
+Output from applying result path of $: {}
+State output after applying output path of $: {}
+State output: {}
+Terminating simulation of state machine
+"""
+
 
 def test_retrier_zero_max_attempts():
     task_state = TaskState("Task", resource="123").add_retrier(
@@ -27,7 +79,14 @@ def test_compile_retrier_and_catcher():
     }
 
 
-def test_catcher(capture_stdout):
+@pytest.mark.parametrize(
+    ("error_equals", "expected_stdout"),
+    [
+        (["States.ALL"], CATCHER_MATCHED_STDOUT),
+        (["Timeout"], NO_CATCHER_MATCHED_STDOUT),
+    ],
+)
+def test_catcher(capture_stdout, error_equals, expected_stdout):
     resource = "123"
     task_state = TaskState("Task", resource=resource)
     succeed_state = SucceedState("Success")
@@ -35,7 +94,7 @@ def test_catcher(capture_stdout):
     fail_state = FailState("Failure", error="IFailed", cause="I failed!")
     task_state >> succeed_state
     pass_state >> fail_state
-    task_state.add_catcher(["States.ALL"], next_state=pass_state)
+    task_state.add_catcher(error_equals, next_state=pass_state)
     state_machine = StateMachine(start_state=task_state)
 
     def failure_mock_fn(event, context):
@@ -44,50 +103,7 @@ def test_catcher(capture_stdout):
     stdout = capture_stdout(
         lambda: state_machine.simulate(resource_to_mock_fn={resource: failure_mock_fn})
     )
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing TaskState('Task')
-State input: {}
-State input after applying input path of $: {}
-TaskFailedError encountered in state
-Checking for catchers
-Found catcher, transitioning to PassState('Pass')
-State output: {}
-Executing PassState('Pass')
-State input: {}
-State input after applying input path of $: {}
-Output from applying result path of $: {}
-State output after applying output path of $: {}
-State output: {}
-Executing FailState('Failure', error='IFailed', cause='I failed!')
-State input: {}
-FailStateError encountered in state
-Checking for catchers
-State output: {}
-Terminating simulation of state machine
-"""
-    )
-
-    # Test no catcher matched
-    task_state.catchers.pop()  # Remove States.ALL catcher
-    task_state.add_catcher(["Timeout"], next_state=pass_state)
-    stdout = capture_stdout(
-        lambda: state_machine.simulate(resource_to_mock_fn={resource: failure_mock_fn})
-    )
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing TaskState('Task')
-State input: {}
-State input after applying input path of $: {}
-TaskFailedError encountered in state
-Checking for catchers
-No catchers were matched
-State output: {}
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == expected_stdout
 
 
 def test_multiple_catchers(capture_stdout):
@@ -124,22 +140,4 @@ def test_multiple_catchers(capture_stdout):
         lambda: state_machine.simulate(resource_to_mock_fn={resource: failure_mock_fn})
     )
 
-    assert (
-        stdout
-        == """Starting simulation of state machine
-Executing TaskState('Task')
-State input: {}
-State input after applying input path of $: {}
-TaskFailedError encountered in state
-Checking for catchers
-Found catcher, transitioning to PassState('Task Failed')
-State output: {}
-Executing PassState('Task Failed')
-State input: {}
-State input after applying input path of $: {}
-Output from applying result path of $: {}
-State output after applying output path of $: {}
-State output: {}
-Terminating simulation of state machine
-"""
-    )
+    assert stdout == MULTIPLE_CATCHERS_STDOUT
@@ -3,8 +3,30 @@ import re
 import pytest
 
 from awsstepfuncs import AWSStepFuncsValueError
+from awsstepfuncs import reference_path as reference_path_module
 from awsstepfuncs.reference_path import ReferencePath
 
+MUST_BEGIN_WITH_DOLLAR = re.compile(re.escape('Reference Path must begin with "$"'))
+
+VALID_REFERENCE_PATHS = (
+    r"$.store.book",
+    r"$.store\.book",
+    r"$.\stor\e.boo\k",
+    r"$.store.book.title",
+    r"$.foo.\.bar",
+    # TODO: The following reference path should be valid by example: https://states-language.net/spec.html#ref-paths
+    # But there is a "?" which is considered an invalid operator, but perhaps in
+    # this scenario it's not considered an operator
+    # "$.foo\@bar.baz\[\[.\?pretty",
+    r"$.&Ж中.\uD800\uDF46",
+    r"$.ledgers.branch[0].pending.count",
+    r"$.ledgers.branch[0]",
+    r"$.ledgers[0][22][315].foo",
+    r"$['store']['book']",
+    r"$['store'][0]['book']",
+)
+VALID_REFERENCE_PATH_IDS = tuple(f"path{i}" for i in range(len(VALID_REFERENCE_PATHS)))
+
 
 @pytest.fixture(scope="session")
 def sample_data():
@@ -14,12 +36,43 @@ def sample_data():
         "car": {
             "cdr": True,
         },
+        "baz": "qux",
+        "dotted.key": 456,
+        "0": "zero",
+        "it's": 789,
     }
 
 
 @pytest.mark.parametrize(
     ("reference_path", "match"),
-    [("$.foo", 123), ("$.bar", ["a", "b", "c"]), ("$.car.cdr", True)],
+    [
+        ("$.foo", 123),
+        ("$.bar", ["a", "b", "c"]),
+        ("$.car.cdr", True),
+        ("$.bar[1]", "b"),
+        ("$['car']['cdr']", True),
+        (r"$.\f\oo", 123),
+        # Negative indices count from the end, as in jsonpath_rw
+        ("$.bar[-1]", "c"),
+        ("$.bar[ -3 ]", "a"),
+        # Strings can be indexed, as in jsonpath_rw
+        ("$.baz[0]", "q"),
+        ("$.baz[-1]", "x"),
+        # Whitespace between steps and quoted fields are allowed, as in jsonpath_rw
+        ("$.car .cdr", True),
+        ("$ . car. cdr ", True),
+        ("$.car.'cdr'", True),
+        # Unquoted bracket fields and escapes in quoted fields, as in jsonpath_rw
+        ("$.car[cdr]", True),
+        ("$[ car ][ cdr ]", True),
+        ('$["it\'s"]', 789),
+        (r"$['it\'s']", 789),
+        (r"$.'it\'s'", 789),
+        (r"$['c\ar'].cdr", True),
+        # Escaped dots and digit fields could not be applied with jsonpath_rw
+        (r"$.dotted\.key", 456),
+        ("$.0", "zero"),
+    ],
 )
 def test_apply_reference_path(reference_path, match, sample_data):
     assert ReferencePath(reference_path).apply(sample_data) == match
@@ -33,36 +86,88 @@ def test_reference_path_unsupported_operator():
 
 
 def test_reference_path_must_begin_with_dollar():
-    with pytest.raises(
-        AWSStepFuncsValueError, match=re.escape('Reference Path must begin with "$"')
-    ):
+    with pytest.raises(AWSStepFuncsValueError, match=MUST_BEGIN_WITH_DOLLAR):
         ReferencePath("foo[*].baz")
 
 
-def test_apply_reference_path_no_match(sample_data):
-    assert ReferencePath("$.notfound").apply(sample_data) is None
+@pytest.mark.parametrize(
+    "reference_path",
+    [
+        "$.notfound",
+        "$.bar[3]",
+        "$.foo.baz",
+        # jsonpath_rw raised IndexError and KeyError for these
+        "$.bar[-4]",
+        "$.car[0]",
+    ],
+)
+def test_apply_reference_path_no_match(reference_path, sample_data):
+    assert ReferencePath(reference_path).apply(sample_data) is None
 
 
 @pytest.mark.parametrize(
     "reference_path",
     [
-        r"$.store.book",
-        r"$.store\.book",
-        r"$.\stor\e.boo\k",
-        r"$.store.book.title",
-        r"$.foo.\.bar",
-        # TODO: The following reference path should be valid by example: https://states-language.net/spec.html#ref-paths
-        # But there is a "?" which is considered an invalid operator, but perhaps in
-        # this scenario it's not considered an operator
-        # "$.foo\@bar.baz\[\[.\?pretty",
-        r"$.&Ж中.\uD800\uDF46",
-        r"$.ledgers.branch[0].pending.count",
-        r"$.ledgers.branch[0]",
-        r"$.ledgers[0][22][315].foo",
-        r"$['store']['book']",
-        r"$['store'][0]['book']",
+        "$foo",
+        "$.car.c dr",
+        "$.bar[- 1]",
+        "$.car[]",
+        "$.car['cdr'",
+        # jsonpath_rw selected the root, current and parent node for these
+        "$.car.$",
+        "$.`this`",
+        "$.car.`parent`",
     ],
 )
+def test_malformed_reference_path(reference_path):
+    with pytest.raises(
+        AWSStepFuncsValueError,
+        match=re.escape(f'Malformed Reference Path: "{reference_path}"'),
+    ):
+        ReferencePath(reference_path)
+
+
+@pytest.mark.parametrize(
+    "reference_path", VALID_REFERENCE_PATHS, ids=VALID_REFERENCE_PATH_IDS
+)
 def test_valid_reference_path(reference_path):
     # Should not raise any ValueError
     ReferencePath(reference_path)
+
+
+def test_reference_path_is_shared():
+    reference_path = ReferencePath("$.store.book")
+    assert ReferencePath("$.store.book") is reference_path
+    assert ReferencePath("") is ReferencePath("$")
+
+    ReferencePath.cache_clear()
+    assert ReferencePath("$.store.book") is not reference_path
+
+
+@pytest.fixture()
+def empty_cache():
+    """Start without cached Reference Paths and drop the ones the test cached."""
+    ReferencePath.cache_clear()
+    yield
+    ReferencePath.cache_clear()
+
+
+@pytest.mark.parametrize("reference_path", ["$", "$.store.book"])
+def test_reference_path_is_parsed_once(reference_path, monkeypatch, empty_cache):
+    parsed = []
+
+    def mock_parse_steps(reference_path):
+        parsed.append(reference_path)
+        return ()
+
+    monkeypatch.setattr(reference_path_module, "_parse_steps", mock_parse_steps)
+
+    ReferencePath(reference_path)
+    ReferencePath(reference_path)
+    assert parsed == [reference_path]
+
+
+def test_invalid_reference_path_is_not_cached():
+    for _ in range(2):
+        with pytest.raises(AWSStepFuncsValueError, match=MUST_BEGIN_WITH_DOLLAR):
+            ReferencePath("foo")
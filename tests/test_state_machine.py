@@ -1,4 +1,5 @@
 import json
+import re
 
 import pytest
 
@@ -9,6 +10,11 @@ from awsstepfuncs import (
     StateMachine,
     TaskState,
 )
+from awsstepfuncs import state_machine as state_machine_module
+
+DUPLICATE_NAMES = re.compile(
+    re.escape("Duplicate names detected in state machine. Names must be unique")
+)
 
 
 def test_duplicate_names():
@@ -16,10 +22,7 @@ def test_duplicate_names():
     pass_state1 = PassState(duplicate_name)
     pass_state2 = PassState(duplicate_name)
     pass_state1 >> pass_state2
-    with pytest.raises(
-        AWSStepFuncsValueError,
-        match="Duplicate names detected in state machine. Names must be unique",
-    ):
+    with pytest.raises(AWSStepFuncsValueError, match=DUPLICATE_NAMES):
         StateMachine(start_state=pass_state1)
 
 
@@ -28,13 +31,21 @@ def test_duplicate_names_catcher():
     task_state = TaskState(duplicate_name, resource="123")
     transition_state = FailState(duplicate_name, error="MyError", cause="Negligence")
     task_state.add_catcher(["Something"], next_state=transition_state)
-    with pytest.raises(
-        AWSStepFuncsValueError,
-        match="Duplicate names detected in state machine. Names must be unique",
-    ):
+    with pytest.raises(AWSStepFuncsValueError, match=DUPLICATE_NAMES):
         StateMachine(start_state=task_state)
 
 
+def test_all_states_catcher_cycle():
+    task_state = TaskState("Task", resource="123")
+    pass_state = PassState("Pass")
+    retry_state = TaskState("Retry", resource="456")
+    task_state >> pass_state >> retry_state
+    task_state.add_catcher(["Something"], next_state=pass_state)
+    retry_state.add_catcher(["States.ALL"], next_state=task_state)
+    state_machine = StateMachine(start_state=task_state)
+    assert state_machine.all_states == {task_state, pass_state, retry_state}
+
+
 def test_to_json(tmp_path):
     pass_state = PassState("My Pass", comment="The only state")
     state_machine = StateMachine(
@@ -58,3 +69,32 @@ def test_to_json(tmp_path):
             },
         },
     }
+
+
+@pytest.mark.parametrize(
+    ("use_orjson", "expected"),
+    [
+        (
+            True,
+            '{"StartAt":"Žádost","States":{"Žádost":{"Type":"Pass","End":true}}}',
+        ),
+        (
+            False,
+            '{"StartAt": "\\u017d\\u00e1dost", "States": '
+            '{"\\u017d\\u00e1dost": {"Type": "Pass", "End": true}}}',
+        ),
+    ],
+    ids=["orjson", "json"],
+)
+def test_to_json_output(tmp_path, monkeypatch, use_orjson, expected):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(state_machine_module, "orjson", None)
+    state_machine = StateMachine(start_state=PassState("Žádost"))
+
+    compiled_path = tmp_path / "state_machine.json"
+    state_machine.to_json(compiled_path)
+
+    assert compiled_path.read_bytes() == expected.encode()
+    assert json.loads(compiled_path.read_bytes()) == state_machine.compile()
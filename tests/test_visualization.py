@@ -6,6 +6,11 @@ binaries). Therefore, these tests just check if the file gets created and that
 there are no runtime exceptions when running the code.
 """
 
+import os
+import time
+from io import BytesIO
+from pathlib import Path
+
 import pytest
 
 from awsstepfuncs import (
@@ -20,10 +25,36 @@ from awsstepfuncs import (
     TaskState,
     VariableChoice,
 )
+from awsstepfuncs import visualization as visualization_module
 from awsstepfuncs.errors import AWSStepFuncsValueError
 from awsstepfuncs.visualization import Visualization
 
 
+@pytest.fixture()
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
+
+
+@pytest.fixture()
+def rendered(monkeypatch):
+    """Record the rendered frames instead of running Graphviz and Pillow."""
+    rendered = {"graphs": [], "engines": [], "frames": [], "durations": []}
+
+    def mock_render_frame(graph, *, size, engine):
+        rendered["graphs"].append(graph)
+        rendered["engines"].append(engine)
+        return graph.encode()
+
+    def mock_save_animation(self, frames, *, size, durations):
+        rendered["frames"].extend(frames)
+        rendered["durations"].extend(durations)
+        self.output_path.write_bytes(b"".join(frames))
+
+    monkeypatch.setattr(Visualization, "_render_frame", staticmethod(mock_render_frame))
+    monkeypatch.setattr(Visualization, "_save_animation", mock_save_animation)
+    return rendered
+
+
 def test_visualization(tmp_path):
     resource = "123"
     task_state = TaskState("My task", resource=resource)
@@ -131,6 +162,368 @@ def test_visualization_choice_state(tmp_path):
 def test_bad_file_extension():
     state = PassState("Public")
     with pytest.raises(
-        AWSStepFuncsValueError, match='Visualization output path must end with ".gif"'
+        AWSStepFuncsValueError,
+        match='Visualization output path must end with ".gif" or ".png"',
     ):
-        Visualization(start_state=state, output_path="state_machine.png")
+        Visualization(start_state=state, output_path="state_machine.jpg")
+
+
+def test_png_requires_pillow(monkeypatch):
+    monkeypatch.setattr(visualization_module, "Image", None)
+    with pytest.raises(ImportError, match="Pillow is required"):
+        Visualization(start_state=PassState("Public"), output_path="state_machine.png")
+
+
+def test_repeated_transition_is_shown_longer(tmp_path, rendered):
+    pass_state = PassState("Pass")
+    succeed_state = SucceedState("Succeed")
+    pass_state >> succeed_state
+    visualization = Visualization(
+        start_state=pass_state, output_path=tmp_path / "state_machine.png"
+    )
+
+    visualization.highlight_state_transition(pass_state, succeed_state)
+    n_steps = len(visualization.animation.steps())
+    visualization.highlight_state_transition(pass_state, succeed_state)
+    assert len(visualization.animation.steps()) == n_steps
+
+    visualization.highlight_state(succeed_state)
+    visualization.highlight_state_transition(pass_state, succeed_state)
+    assert len(visualization.animation.steps()) == n_steps
+
+    visualization.highlight_state(pass_state)
+    visualization.highlight_state_transition(pass_state, succeed_state)
+    assert len(visualization.animation.steps()) == n_steps + 2
+
+    visualization.render()
+    assert rendered["durations"] == [500, 1500, 1500, 500, 500]
+
+
+def test_simulate_repeated_transition_is_shown_longer(tmp_path, rendered):
+    succeed_state = SucceedState("Succeed")
+    unwrap_choice = VariableChoice("$.a", is_present=True, next_state=succeed_state)
+    choice_state = ChoiceState(
+        "Unwrap", choices=[unwrap_choice], default=succeed_state, output_path="$.a"
+    )
+    # Loop back to the Choice State until there is nothing left to unwrap
+    unwrap_choice.next_state = choice_state
+    state_machine = StateMachine(start_state=choice_state)
+
+    state_machine.simulate(
+        {"a": {"a": {}}},
+        show_visualization=True,
+        visualization_output_path=tmp_path / "state_machine.png",
+    )
+
+    # Unwrap, Unwrap -> Unwrap (twice in a row), Unwrap, Unwrap -> Succeed, Succeed
+    assert rendered["durations"] == [500, 1000, 1000, 500, 500]
+
+
+def test_state_graph_with_shared_catcher():
+    first_task = TaskState("First", resource="123")
+    second_task = TaskState("Second", resource="123")
+    fail_state = FailState("Fail", error="MyError", cause="Failure")
+    first_task >> second_task
+    first_task.add_catcher(["States.ALL"], next_state=fail_state)
+    second_task.add_catcher(["States.ALL"], next_state=fail_state)
+
+    nodes, edges = Visualization._collect_state_graph(
+        first_task, visited=set(), seen_edges=set()
+    )
+    assert sorted(nodes) == ["Fail", "First", "Second"]
+    assert sorted(edges) == [
+        ("First", "Fail"),
+        ("First", "Second"),
+        ("Second", "Fail"),
+    ]
+
+
+def test_state_graph_with_cycle():
+    task_state = TaskState("Task", resource="123")
+    retry_state = PassState("Retry")
+    succeed_state = SucceedState("Succeed")
+    task_state >> succeed_state
+    task_state.add_catcher(["States.ALL"], next_state=retry_state)
+    retry_state >> task_state
+
+    nodes, edges = Visualization._collect_state_graph(
+        task_state, visited=set(), seen_edges=set()
+    )
+    assert sorted(nodes) == ["Retry", "Succeed", "Task"]
+    assert sorted(edges) == [
+        ("Retry", "Task"),
+        ("Task", "Retry"),
+        ("Task", "Succeed"),
+    ]
+
+
+def test_add_subgraph():
+    task_state = TaskState("Task", resource="123")
+    succeed_state = SucceedState("Succeed")
+    task_state >> succeed_state
+    visualization = Visualization(start_state=task_state)
+    assert visualization.animation.steps()[0].E == {("Task", "Succeed")}
+
+    pass_state = PassState("Pass")
+    fail_state = FailState("Fail", error="MyError", cause="Failure")
+    pass_state >> fail_state
+    task_state.add_catcher(["States.ALL"], next_state=pass_state)
+    visualization.add_subgraph(task_state)
+
+    step = visualization.animation.steps()[0]
+    assert step.V == {"Task", "Succeed", "Pass", "Fail"}
+    assert step.E == {("Task", "Succeed"), ("Task", "Pass"), ("Pass", "Fail")}
+
+
+def test_render_identical_frames_once(tmp_path, rendered):
+    first_state = PassState("First")
+    second_state = PassState("Second")
+    first_state >> second_state
+    visualization = Visualization(
+        start_state=first_state, output_path=tmp_path / "state_machine.png"
+    )
+    for _ in range(3):
+        visualization.highlight_state(first_state)
+        visualization.highlight_state_transition(first_state, second_state)
+        visualization.highlight_state(second_state)
+        visualization.highlight_state_transition(second_state, first_state)
+    visualization.render()
+
+    graphs = visualization.animation.graphs()
+    assert rendered["frames"] == [graph.encode() for graph in graphs]
+    assert sorted(rendered["graphs"]) == sorted(set(graphs))
+    assert len(rendered["graphs"]) < len(graphs)
+
+
+def test_render_cached(tmp_path, rendered, cache_dir):
+    state = PassState("Public")
+    first_path = tmp_path / "first.png"
+    Visualization(
+        start_state=state, output_path=first_path, cache_dir=cache_dir
+    ).render()
+    n_first_rendered_frames = len(rendered["graphs"])
+    assert len(list(cache_dir.iterdir())) == 1
+
+    second_path = tmp_path / "second.png"
+    Visualization(
+        start_state=state, output_path=second_path, cache_dir=cache_dir
+    ).render()
+    assert len(rendered["graphs"]) == n_first_rendered_frames
+    assert second_path.read_bytes() == first_path.read_bytes()
+
+    # Nothing is cached unless a cache directory is set
+    Visualization(start_state=state, output_path=second_path).render()
+    Visualization(start_state=state, output_path=second_path).render()
+    assert len(rendered["graphs"]) == 3 * n_first_rendered_frames
+
+
+def test_render_cache_not_writable(tmp_path, rendered, cache_dir):
+    cache_dir.write_bytes(b"")  # A file where the directory should be
+    output_path = tmp_path / "state_machine.png"
+    Visualization(
+        start_state=PassState("Public"), output_path=output_path, cache_dir=cache_dir
+    ).render()
+
+    assert output_path.exists()
+
+
+def test_render_cache_expires(tmp_path, cache_dir):
+    cache_dir.mkdir()
+    expired_path = cache_dir / "expired.gif"
+    expired_path.touch()
+    expired_time = time.time() - visualization_module.CACHE_TTL.total_seconds() - 1
+    os.utime(expired_path, (expired_time, expired_time))
+    fresh_path = cache_dir / "fresh.gif"
+    fresh_path.touch()
+
+    Visualization._evict_expired_cache_entries(cache_dir)
+
+    assert not expired_path.exists()
+    assert fresh_path.exists()
+
+
+def test_render_cache_entry_removed_concurrently(
+    tmp_path, monkeypatch, rendered, cache_dir
+):
+    output_path = tmp_path / "state_machine.png"
+    visualization = Visualization(
+        start_state=PassState("Public"), output_path=output_path, cache_dir=cache_dir
+    )
+    visualization.render()
+    (cached_path,) = cache_dir.iterdir()
+    expired_time = time.time() - visualization_module.CACHE_TTL.total_seconds() - 1
+    os.utime(cached_path, (expired_time, expired_time))
+    output_path.unlink()
+
+    def mock_unlink(path):
+        # Another render evicts the entry first
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(Path, "unlink", mock_unlink)
+    visualization.render()
+
+    assert len(rendered["frames"]) == 2  # The single frame was rendered again
+    assert output_path.read_bytes() == rendered["frames"][-1]
+    assert list(cache_dir.iterdir()) == [cached_path]
+    assert cached_path.stat().st_mtime > expired_time
+    assert cached_path.read_bytes() == output_path.read_bytes()
+
+
+def test_render_large_graph_with_sfdp(tmp_path, rendered):
+    start_state = previous_state = PassState("Pass 0")
+    for index in range(1, visualization_module.MAX_DOT_NODES + 1):
+        previous_state = previous_state >> PassState(f"Pass {index}")
+    Visualization(
+        start_state=start_state, output_path=tmp_path / "state_machine.png"
+    ).render()
+
+    assert set(rendered["engines"]) == {"sfdp"}
+
+
+@pytest.mark.parametrize(
+    ("n_states", "engine", "expected_engine"),
+    [
+        (1, None, "dot"),
+        (visualization_module.MAX_DOT_NODES + 1, "dot", "dot"),
+        (1, "sfdp", "sfdp"),
+    ],
+)
+def test_render_engine(tmp_path, rendered, n_states, engine, expected_engine):
+    start_state = previous_state = PassState("Pass 0")
+    for index in range(1, n_states):
+        previous_state = previous_state >> PassState(f"Pass {index}")
+    Visualization(
+        start_state=start_state, output_path=tmp_path / "state_machine.png"
+    ).render(engine=engine)
+
+    assert set(rendered["engines"]) == {expected_engine}
+
+
+def test_render_cached_per_engine(tmp_path, rendered, cache_dir):
+    state = PassState("Public")
+    output_path = tmp_path / "state_machine.png"
+    for engine in ["dot", "sfdp"]:
+        Visualization(
+            start_state=state, output_path=output_path, cache_dir=cache_dir
+        ).render(engine=engine)
+
+    assert set(rendered["engines"]) == {"dot", "sfdp"}
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_render_gif_frames_to_tmp_dir(tmp_path, monkeypatch, rendered):
+    gif_files = []
+
+    def mock_gif(files, basename, *, delay, size):
+        gif_files.extend(files)
+        Path(f"{basename}.gif").write_bytes(b"")
+
+    monkeypatch.setattr(visualization_module.gvanim, "gif", mock_gif)
+    monkeypatch.setattr(visualization_module, "Image", None)
+
+    frames_dir = tmp_path / "frames"
+    Visualization(
+        start_state=PassState("Public"), output_path=tmp_path / "state_machine.gif"
+    ).render(tmp_dir=frames_dir)
+
+    assert not rendered["frames"]
+    assert gif_files
+    for file in gif_files:
+        assert Path(file).parent == frames_dir
+        assert Path(file).exists()
+
+
+def test_render_gif_repeated_frames_to_tmp_dir(tmp_path, monkeypatch, rendered):
+    gif_files = []
+
+    def mock_gif(files, basename, *, delay, size):
+        gif_files.extend(files)
+        Path(f"{basename}.gif").write_bytes(b"")
+
+    monkeypatch.setattr(visualization_module.gvanim, "gif", mock_gif)
+    monkeypatch.setattr(visualization_module, "Image", None)
+
+    state = PassState("Loop")
+    visualization = Visualization(
+        start_state=state, output_path=tmp_path / "state_machine.gif"
+    )
+    for _ in range(3):
+        visualization.highlight_state(state)
+        visualization.highlight_state_transition(state, state)
+    visualization.render(tmp_dir=tmp_path / "frames")
+
+    # The loop's frames are listed once per repetition
+    assert [Path(file).name for file in gif_files] == [
+        "state_machine_000.png",
+        *["state_machine_001.png"] * 3,
+        *["state_machine_002.png"] * 3,
+    ]
+
+
+def test_simulate_gif_frames_to_tmp_dir(tmp_path, monkeypatch, rendered):
+    gif_files = []
+
+    def mock_gif(files, basename, *, delay, size):
+        gif_files.extend(files)
+        Path(f"{basename}.gif").write_bytes(b"")
+
+    monkeypatch.setattr(visualization_module.gvanim, "gif", mock_gif)
+    monkeypatch.setattr(visualization_module, "Image", None)
+
+    frames_dir = tmp_path / "frames"
+    StateMachine(start_state=PassState("Public")).simulate(
+        show_visualization=True,
+        visualization_output_path=tmp_path / "state_machine.gif",
+        visualization_tmp_dir=frames_dir,
+    )
+
+    assert gif_files
+    assert all(Path(file).parent == frames_dir for file in gif_files)
+
+
+@pytest.mark.parametrize("suffix", [".png", ".gif"])
+def test_save_animation(tmp_path, suffix):
+    Image = pytest.importorskip("PIL.Image")
+    frames = []
+    for color in ["red", "blue"]:
+        buffer = BytesIO()
+        Image.new("RGB", (10, 20), color).save(buffer, format="PNG")
+        frames.append(buffer.getvalue())
+
+    output_path = tmp_path / f"state_machine{suffix}"
+    visualization = Visualization(
+        start_state=PassState("Public"), output_path=output_path
+    )
+    visualization._save_animation(frames, size=30, durations=[500, 1000])
+
+    with Image.open(output_path) as animation:
+        assert animation.size == (30, 30)
+        assert animation.n_frames == 2
+        animation.seek(1)
+        assert animation.info["duration"] == 1000
+
+
+def test_render_gif_in_memory(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+
+    def mock_render_frame(graph, *, size, engine):
+        buffer = BytesIO()
+        Image.new("RGB", (10, 10), "white").save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def mock_gif(files, basename, *, delay, size):
+        raise AssertionError("GIF frames should not be written to disk")
+
+    monkeypatch.setattr(Visualization, "_render_frame", staticmethod(mock_render_frame))
+    monkeypatch.setattr(visualization_module.gvanim, "gif", mock_gif)
+
+    frames_dir = tmp_path / "frames"
+    output_path = tmp_path / "state_machine.gif"
+    Visualization(start_state=PassState("Public"), output_path=output_path).render(
+        tmp_dir=frames_dir
+    )
+
+    assert not frames_dir.exists()
+    with Image.open(output_path) as animation:
+        assert animation.format == "GIF"